@@ -56,6 +56,24 @@ class Config:
         else:
             return None
 
+    def get_history_retention(self):
+        """
+        Returns the maximum number of snapshots kept for a JSON file.
+        """
+        if self.config.get("history_retention"):
+            return self.config["history_retention"]
+        else:
+            return 50
+
+    def get_history_base_interval(self):
+        """
+        Returns how many snapshots are taken between two full base snapshots.
+        """
+        if self.config.get("history_base_interval"):
+            return self.config["history_base_interval"]
+        else:
+            return 10
+
     def set_json_directory(self, directory: str):
         """
         Sets the directory where the JSON files are stored.
@@ -2,8 +2,15 @@ import io
 import segno
 import json as JSON
 import os
+import re
+import hashlib
+import tempfile
 import pyotp
 import time
+from otpauth import ALGORITHMS, TotpParams
+
+QR_IMAGE_KINDS = ("png", "svg")
+QR_MANIFEST_FILE = ".export-qr.json"
 
 def get_file_contents(file_dir: str) -> str:
     """
@@ -41,6 +48,66 @@ def create_qr_code(link: str) -> str:
     utf_code = out.getvalue()
     return utf_code
 
+def qr_image_filename(name: str, link: str, kind: str, scale: int) -> str:
+    """
+    Builds a content-hashed filename for a QR image.
+
+    Args:
+        name (str): The name of the account.
+        link (str): The otpauth link encoded in the QR code.
+        kind (str): The image format, either "png" or "svg".
+        scale (int): The size of a single QR module in pixels.
+
+    Returns:
+        str: A filename that only changes when the rendered image would change.
+    """
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", name or "account").strip("_") or "account"
+    digest = hashlib.sha256(f"{link}|{kind}|{scale}".encode("utf-8")).hexdigest()[:12]
+    return f"{safe_name}-{digest}.{kind}"
+
+def render_qr_image(link: str, path: str, kind: str, scale: int) -> str:
+    """
+    Renders a QR code to an image file. Writes to a temporary file first so a
+    failed or interrupted render never leaves a partial image under the final name.
+
+    Args:
+        link (str): The otpauth link to encode.
+        path (str): The path of the image to write.
+        kind (str): The image format, either "png" or "svg".
+        scale (int): The size of a single QR module in pixels.
+
+    Returns:
+        str: The path of the written image.
+    """
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=".", suffix=f".{kind}.tmp", delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        qr = segno.make(link)
+        qr.save(tmp_path, kind=kind, scale=scale, border=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+def load_qr_manifest(directory: str) -> dict:
+    """
+    Loads the manifest of the images export-qr has written to a directory.
+
+    Args:
+        directory (str): The export directory.
+
+    Returns:
+        dict: The image filenames mapped to the account name, format and scale they were rendered for.
+    """
+    manifest_file = os.path.join(directory, QR_MANIFEST_FILE)
+    if not os.path.isfile(manifest_file):
+        return {}
+    return JSON.loads(get_file_contents(manifest_file))
+
+def save_qr_manifest(directory: str, manifest: dict) -> int:
+    return write_file(os.path.join(directory, QR_MANIFEST_FILE), JSON.dumps(manifest))
+
 def get_data_list(json: str, config) -> list:
     json = test_json(json, config)
     if json is None:
@@ -79,6 +146,7 @@ def test_txt(txt: str, config) -> int:
     
     return txt
 
-def gen_code(secret: str) -> str:
-    totp = pyotp.TOTP(secret)
-    return totp.now()
\ No newline at end of file
+def gen_code(params: TotpParams) -> str:
+    secret = params.secret.replace(" ", "")
+    totp = pyotp.TOTP(secret, digits=params.digits, digest=ALGORITHMS[params.algorithm], interval=params.period)
+    return totp.now()
@@ -1,5 +1,6 @@
 from two_factor_auth_tool import TwoFactorAuthTool
 import argparse
+import multiprocessing
 import sys
 import os
 import json
@@ -19,6 +20,10 @@ def main():
     parser_add.add_argument("--secret", help="Specify the secret key for 2FA.")
     parser_add.add_argument("--backup", help="Specify the backup codes for 2FA.")
     parser_add.add_argument("--phrase", help="Specify the phrase for 2FA (Like crypto wallet phrases).")
+    parser_add.add_argument("--algorithm", choices=["SHA1", "SHA256", "SHA512"], type=str.upper, help="Specify the hash algorithm for 2FA (Default: SHA1).")
+    parser_add.add_argument("--digits", type=int, help="Specify the number of digits in a 2FA code (Default: 6).")
+    parser_add.add_argument("--period", type=int, help="Specify the number of seconds a 2FA code is valid for (Default: 30).")
+    parser_add.add_argument("--uri", help="Specify an otpauth:// URI to take any unspecified values from.")
     parser_add.add_argument("-f", "--force", action="store_true", help="Force the adding of duplicate data.")
 
     # Remove parser
@@ -50,6 +55,14 @@ def main():
     parser_get_qr.add_argument("--backup", help="Get QR based on the backup codes for 2FA.")
     parser_get_qr.add_argument("--phrase", help="Get QR based on the phrase for 2FA (Like crypto wallet phrases).")
 
+    # Export QR parser
+    parser_export_qr = subparsers.add_parser("export-qr", help="Export a QR image for every 2FA object in the JSON file to a directory.")
+    parser_export_qr.add_argument("--json", help="Specify the JSON file.")
+    parser_export_qr.add_argument("--dir", help="Specify the output directory.")
+    parser_export_qr.add_argument("--format", choices=["png", "svg"], default="png", help="Specify the image format (Default: png).")
+    parser_export_qr.add_argument("--scale", type=int, default=8, help="Specify the size of a QR module in pixels (Default: 8).")
+    parser_export_qr.add_argument("--workers", type=int, help="Specify the number of render workers (Default: CPU count).")
+
     # Set parser
     parser_set = subparsers.add_parser("set", help="Set the default location of the TXT and/or JSON files.")
     parser_set.add_argument("--json", help="Set the JSON file.")
@@ -83,6 +96,9 @@ def main():
     parser_code.add_argument("--json", help="Specify the JSON file.")
     parser_code.add_argument("--name", help="Specify the name of the account.")
     parser_code.add_argument("--secret", help="Specify the secret key for 2FA.")
+    parser_code.add_argument("--algorithm", choices=["SHA1", "SHA256", "SHA512"], type=str.upper, help="Specify the hash algorithm used with --secret (Default: SHA1).")
+    parser_code.add_argument("--digits", type=int, help="Specify the number of digits used with --secret (Default: 6).")
+    parser_code.add_argument("--period", type=int, help="Specify the period in seconds used with --secret (Default: 30).")
 
     # Nuke parser
     parser_nuke = subparsers.add_parser("nuke", help="Remove all 2FA objects from the JSON *AND* TXT files.")
@@ -90,6 +106,16 @@ def main():
     parser_nuke.add_argument("--text", help="Specify the 2FA text file.")
     parser_nuke.add_argument("-f", "--force", action="store_true", help="Force deletion of all objects that match.")
 
+    # History parser
+    parser_history = subparsers.add_parser("history", help="List the snapshots taken of the JSON file before each change. Each one holds the file as it was up to that change.")
+    parser_history.add_argument("--json", help="Specify the JSON file.")
+
+    # Restore parser
+    parser_restore = subparsers.add_parser("restore", help="Restore the JSON file to a snapshot. Run update afterwards to refresh the TXT file.")
+    parser_restore.add_argument("--json", help="Specify the JSON file.")
+    parser_restore.add_argument("--at", help="Specify the version number to restore, or an ISO 8601 timestamp to restore the JSON file as it was at that time.")
+    parser_restore.add_argument("-f", "--force", action="store_true", help="Force the restore without confirmation.")
+
     # Parse arguments
 
     args = parser.parse_args()
@@ -98,7 +124,7 @@ def main():
 
     if args.command == "add":
         try:
-            return_code = tool.add(json=args.json, name=args.name, issuer=args.issuer, secret=args.secret, backup=args.backup, phrase=args.phrase, force=args.force)
+            return_code = tool.add(json=args.json, name=args.name, issuer=args.issuer, secret=args.secret, backup=args.backup, phrase=args.phrase, force=args.force, algorithm=args.algorithm, digits=args.digits, period=args.period, uri=args.uri)
             if return_code == 0:
                 print("Successfully added.")
             else:
@@ -138,6 +164,17 @@ def main():
             print(f"Error: {e}")
             sys.exit(1)
 
+    elif args.command == "export-qr":
+        try:
+            return_code = tool.export_qr(json=args.json, directory=args.dir, kind=args.format, scale=args.scale, workers=args.workers)
+            if return_code == 0:
+                print("Successfully exported QR codes.")
+            else:
+                print("Failed to export QR codes.")
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
     elif args.command == "set":
         try:
             return_code = tool.set_file_directory(json=args.json, text=args.text)
@@ -171,7 +208,7 @@ def main():
 
     elif args.command == "code":
         try:
-            return_code = tool.code(json=args.json, name=args.name, secret=args.secret)
+            return_code = tool.code(json=args.json, name=args.name, secret=args.secret, algorithm=args.algorithm, digits=args.digits, period=args.period)
             if not return_code == 0:
                 print("Failed to generate 2FA code.")
         except Exception as e:
@@ -189,10 +226,31 @@ def main():
             print(f"Error: {e}")
             sys.exit(1)
 
+    elif args.command == "history":
+        try:
+            return_code = tool.history(json=args.json)
+            if not return_code == 0:
+                print("Failed to list snapshots.")
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    elif args.command == "restore":
+        try:
+            return_code = tool.restore(json=args.json, at=args.at, force=args.force)
+            if return_code == 0:
+                print("Successfully restored snapshot.")
+            else:
+                print("Failed to restore snapshot.")
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
     else:
         parser.print_help()
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
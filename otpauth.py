@@ -0,0 +1,118 @@
+import hashlib
+from collections import namedtuple
+from urllib.parse import urlparse, parse_qs, quote, unquote, urlencode
+
+DEFAULT_ALGORITHM = "SHA1"
+DEFAULT_DIGITS = 6
+DEFAULT_PERIOD = 30
+ALGORITHMS = {"SHA1": hashlib.sha1, "SHA256": hashlib.sha256, "SHA512": hashlib.sha512}
+
+TotpParams = namedtuple("TotpParams", ["name", "issuer", "secret", "algorithm", "digits", "period"])
+
+def make_params(name: str, issuer: str, secret: str, algorithm: str, digits, period) -> TotpParams:
+    """
+    Validates and normalizes TOTP parameters. The secret is kept as stored, so
+    links built from it match the ones written before.
+
+    Args:
+        name (str): The name of the account.
+        issuer (str): The issuer of the 2FA.
+        secret (str): The secret key for the 2FA.
+        algorithm (str): The hash algorithm, one of SHA1, SHA256 or SHA512. Defaults to SHA1.
+        digits (int): The number of digits in a code. Defaults to 6.
+        period (int): The number of seconds a code is valid for. Defaults to 30.
+
+    Returns:
+        TotpParams: The normalized parameters.
+    """
+    algorithm = (algorithm or DEFAULT_ALGORITHM).upper()
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithm must be one of: {', '.join(ALGORITHMS)}.")
+    digits = DEFAULT_DIGITS if digits is None else int(digits)
+    if not 6 <= digits <= 10:
+        raise ValueError("Digits must be between 6 and 10.")
+    period = DEFAULT_PERIOD if period is None else int(period)
+    if period < 1:
+        raise ValueError("Period must be positive.")
+    return TotpParams(name, issuer, secret, algorithm, digits, period)
+
+def entry_params(data: dict) -> TotpParams:
+    """
+    Gets the TOTP parameters of a 2FA object from the JSON file.
+
+    Args:
+        data (dict): The 2FA object.
+
+    Returns:
+        TotpParams: The normalized parameters.
+    """
+    return make_params(data.get("name"), data.get("issuer"), data.get("secret"), data.get("algorithm"), data.get("digits"), data.get("period"))
+
+def build_uri(params: TotpParams) -> str:
+    """
+    Builds an otpauth URI. The label is "issuer:name" when there is an issuer, with
+    each part escaped so colons inside them survive a round-trip through parse_uri.
+    Algorithm, digits and period are only included when they differ from the defaults.
+
+    Args:
+        params (TotpParams): The parameters to encode.
+
+    Returns:
+        str: The otpauth URI.
+    """
+    if not params.secret:
+        raise ValueError("A secret is required to build an otpauth URI.")
+    query = {"secret": params.secret}
+    if params.issuer:
+        query["issuer"] = params.issuer
+    if params.algorithm != DEFAULT_ALGORITHM:
+        query["algorithm"] = params.algorithm
+    if params.digits != DEFAULT_DIGITS:
+        query["digits"] = params.digits
+    if params.period != DEFAULT_PERIOD:
+        query["period"] = params.period
+    label = quote(params.name or "", safe="@")
+    if params.issuer:
+        label = f"{quote(params.issuer, safe='@')}:{label}"
+    return f"otpauth://totp/{label}?{urlencode(query, quote_via=quote)}"
+
+def parse_uri(uri: str) -> dict:
+    """
+    Parses an otpauth URI into a 2FA object for the JSON file.
+
+    Args:
+        uri (str): The otpauth URI, e.g. otpauth://totp/Issuer:name?secret=...&issuer=Issuer
+
+    Returns:
+        dict: The 2FA object. Algorithm, digits and period are only set when present in the URI.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme != "otpauth":
+        raise ValueError("URI must start with otpauth://")
+    if parsed.netloc.lower() != "totp":
+        raise ValueError("Only totp URIs are supported.")
+
+    query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+    if not query.get("secret"):
+        raise ValueError("URI does not contain a secret.")
+
+    # Split before unquoting, so an escaped colon stays part of the name.
+    label = parsed.path.lstrip("/")
+    issuer = query.get("issuer")
+    if ":" in label:
+        prefix, label = label.split(":", 1)
+        issuer = issuer or unquote(prefix)
+    label = unquote(label).strip()
+
+    params = make_params(label, issuer, query["secret"], query.get("algorithm"), query.get("digits"), query.get("period"))
+    obj = {"name": params.name}
+    if params.issuer:
+        obj["issuer"] = params.issuer
+    obj["secret"] = params.secret
+    if "algorithm" in query:
+        obj["algorithm"] = params.algorithm
+    if "digits" in query:
+        obj["digits"] = params.digits
+    if "period" in query:
+        obj["period"] = params.period
+    return obj
@@ -5,5 +5,5 @@ setup(
     version="0.1",
     description="2FA Tool",
     executables=[Executable("main.py", base="console", target_name="tfa_tool")],
-    options={"build_exe": {"packages": ["os", "io", "segno", "argparse", "sys", "json", "pyotp"], "include_files": ["config.json"]}},
+    options={"build_exe": {"packages": ["os", "io", "segno", "argparse", "sys", "json", "pyotp", "concurrent", "multiprocessing", "hashlib", "difflib", "datetime", "urllib", "collections"], "include_files": ["config.json"]}},
 )
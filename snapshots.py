@@ -0,0 +1,194 @@
+import json as JSON
+import os
+from datetime import datetime
+from difflib import SequenceMatcher
+from fileutils import get_file_contents, write_file
+
+INDEX_FILE = "index.json"
+
+def get_history_directory(json: str) -> str:
+    """
+    Gets the directory where the snapshots of a JSON file are stored.
+
+    Args:
+        json (str): The directory where the JSON file is located.
+
+    Returns:
+        str: The snapshot directory, next to the JSON file.
+    """
+    return f"{json}.history"
+
+def load_index(history: str) -> list:
+    """
+    Loads the snapshot index, oldest version first.
+
+    Args:
+        history (str): The snapshot directory.
+
+    Returns:
+        list: The snapshot records, or an empty list if there are none.
+    """
+    index_file = os.path.join(history, INDEX_FILE)
+    if not os.path.isfile(index_file):
+        return []
+    return JSON.loads(get_file_contents(index_file))
+
+def save_index(history: str, index: list) -> int:
+    return write_file(os.path.join(history, INDEX_FILE), JSON.dumps(index))
+
+def load_record(history: str, version: int):
+    return JSON.loads(get_file_contents(os.path.join(history, f"{version}.json")))
+
+def save_record(history: str, version: int, contents) -> int:
+    return write_file(os.path.join(history, f"{version}.json"), JSON.dumps(contents))
+
+def diff_entries(old: list, new: list) -> list:
+    """
+    Computes the per-entry changes that turn one version of the data list into another.
+
+    Args:
+        old (list): The previous data list.
+        new (list): The new data list.
+
+    Returns:
+        list: [start, end, entries] operations, each replacing old[start:end] with entries.
+    """
+    old_keys = [JSON.dumps(entry, sort_keys=True) for entry in old]
+    new_keys = [JSON.dumps(entry, sort_keys=True) for entry in new]
+    matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    return [[i1, i2, new[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+def apply_delta(entries: list, delta: list) -> list:
+    """
+    Applies the operations produced by diff_entries to a data list, in place.
+
+    Args:
+        entries (list): The data list the delta was computed against.
+        delta (list): The operations to apply.
+
+    Returns:
+        list: The updated data list.
+    """
+    # Applying back to front keeps the earlier indices valid.
+    for start, end, added in reversed(delta):
+        entries[start:end] = added
+    return entries
+
+def rebuild(history: str, index: list, position: int) -> list:
+    """
+    Rebuilds the data list of a snapshot from the nearest full base before it,
+    applying only the deltas in between.
+
+    Args:
+        history (str): The snapshot directory.
+        index (list): The snapshot index.
+        position (int): The position of the snapshot in the index.
+
+    Returns:
+        list: The data list as it was at that snapshot.
+    """
+    base = position
+    while index[base]["kind"] != "base":
+        base -= 1
+    entries = load_record(history, index[base]["version"])
+    for record in index[base + 1:position + 1]:
+        apply_delta(entries, load_record(history, record["version"]))
+    return entries
+
+def evict(history: str, index: list, retention: int) -> list:
+    """
+    Drops the oldest snapshots until at most `retention` remain. When the dropped
+    base has deltas depending on it, the next snapshot is promoted to a full base.
+
+    Args:
+        history (str): The snapshot directory.
+        index (list): The snapshot index.
+        retention (int): The maximum number of snapshots to keep.
+
+    Returns:
+        list: The remaining snapshot records.
+    """
+    while len(index) > max(retention, 1):
+        oldest = index.pop(0)
+        if index[0]["kind"] == "delta":
+            entries = apply_delta(load_record(history, oldest["version"]), load_record(history, index[0]["version"]))
+            save_record(history, index[0]["version"], entries)
+            index[0]["kind"] = "base"
+        os.remove(os.path.join(history, f"{oldest['version']}.json"))
+    return index
+
+def take_snapshot(json: str, command: str, config) -> int:
+    """
+    Records the current contents of the JSON file before a mutating command.
+    Snapshots are stored as deltas against the previous one, with a full base
+    every `history_base_interval` versions. Unchanged contents are not recorded.
+
+    Args:
+        json (str): The directory where the JSON file is located.
+        command (str): The command about to modify the JSON file.
+        config: The config used for the interval and retention settings.
+
+    Returns:
+        int: The version recorded, or None if nothing was recorded.
+    """
+    try:
+        entries = JSON.loads(get_file_contents(json))
+    except (OSError, ValueError):
+        return None
+
+    history = get_history_directory(json)
+    os.makedirs(history, exist_ok=True)
+    index = load_index(history)
+
+    if index:
+        previous = rebuild(history, index, len(index) - 1)
+        delta = diff_entries(previous, entries)
+        if not delta:
+            return None
+        since_base = len(index) - max(i for i, record in enumerate(index) if record["kind"] == "base")
+        kind = "base" if since_base >= config.get_history_base_interval() else "delta"
+        version = index[-1]["version"] + 1
+    else:
+        kind = "base"
+        version = 1
+
+    save_record(history, version, entries if kind == "base" else delta)
+    index.append({
+        "version": version,
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "command": command,
+        "kind": kind,
+        "count": len(entries),
+    })
+    save_index(history, evict(history, index, config.get_history_retention()))
+    return version
+
+def find_snapshot(index: list, at: str) -> int:
+    """
+    Finds a snapshot by version number, or the one holding the JSON file as it was
+    at a timestamp. Snapshots are taken before each change, so that is the first
+    snapshot taken after the timestamp.
+
+    Args:
+        index (list): The snapshot index.
+        at (str): A version number or an ISO 8601 timestamp.
+
+    Returns:
+        int: The position of the snapshot in the index, len(index) if no snapshot was
+            taken after the timestamp and the current JSON file already holds that state,
+            or None if there is no match.
+    """
+    if at.isdigit():
+        matches = [i for i, record in enumerate(index) if record["version"] == int(at)]
+    else:
+        try:
+            # Naive values are taken as local time, like the stored timestamps.
+            moment = datetime.fromisoformat(at).astimezone()
+        except ValueError:
+            print("Must specify a version number or an ISO 8601 timestamp.")
+            return None
+        later = [i for i, record in enumerate(index) if datetime.fromisoformat(record["timestamp"]).astimezone() > moment]
+        return later[0] if later else len(index)
+    if not matches:
+        return None
+    return matches[-1]
@@ -1,14 +1,17 @@
 import json as JSON
 import os
+from concurrent.futures import ProcessPoolExecutor
 from config import config
-from fileutils import get_file_contents, write_file, create_qr_code, test_json, get_data_list, test_txt, gen_code
+from otpauth import make_params, entry_params, build_uri, parse_uri
+from snapshots import take_snapshot, get_history_directory, load_index, rebuild, find_snapshot
+from fileutils import get_file_contents, write_file, create_qr_code, test_json, get_data_list, test_txt, gen_code, qr_image_filename, render_qr_image, load_qr_manifest, save_qr_manifest, QR_IMAGE_KINDS
     
 class TwoFactorAuthTool:
     """
     A class that represents a 2FA tool for adding and updating 2FA information.
     """
 
-    def add(self, json: str, name: str, issuer: str, secret: str, backup: str, phrase: str, force: bool) -> int:
+    def add(self, json: str, name: str, issuer: str, secret: str, backup: str, phrase: str, force: bool, algorithm: str = None, digits: int = None, period: int = None, uri: str = None) -> int:
         """
         Adds new 2FA information to the JSON file.
 
@@ -20,6 +23,10 @@ class TwoFactorAuthTool:
             backup (str): The backup code for the 2FA.
             phrase (str): The recovery phrase for the 2FA.
             force (bool): A flag indicating whether to force adding duplicate data.
+            algorithm (str): The hash algorithm for the 2FA, one of SHA1, SHA256 or SHA512.
+            digits (int): The number of digits in a 2FA code.
+            period (int): The number of seconds a 2FA code is valid for.
+            uri (str): An otpauth URI to take any unspecified values from.
 
         Returns:
             int: 0 if the operation is successful, 1 otherwise.
@@ -27,6 +34,19 @@ class TwoFactorAuthTool:
         json = test_json(json, config)
         if not json:
             return 1
+        try:
+            if uri:
+                parsed = parse_uri(uri)
+                name = name or parsed.get("name")
+                issuer = issuer or parsed.get("issuer")
+                secret = secret or parsed.get("secret")
+                algorithm = algorithm or parsed.get("algorithm")
+                digits = parsed.get("digits") if digits is None else digits
+                period = parsed.get("period") if period is None else period
+            params = make_params(name, issuer, secret, algorithm, digits, period)
+        except ValueError as e:
+            print(f"Invalid 2FA parameters: {e}")
+            return 1
         data_list = get_data_list(json, config)
         if data_list == 1:
             return 1
@@ -50,9 +70,16 @@ class TwoFactorAuthTool:
             obj["backup"] = backup
         if phrase:
             obj["phrase"] = phrase
+        if algorithm:
+            obj["algorithm"] = params.algorithm
+        if digits is not None:
+            obj["digits"] = params.digits
+        if period is not None:
+            obj["period"] = params.period
         data_list.append(obj)
         data_list.sort(key=lambda x: x["name"].lower())
 
+        take_snapshot(json, "add", config)
         write_file(json, JSON.dumps(data_list))
 
         return 0
@@ -91,6 +118,7 @@ class TwoFactorAuthTool:
             print("Too many objects removed. Pass -f to force.")
             return 1
 
+        take_snapshot(json, "remove", config)
         write_file(json, JSON.dumps(new_data_list))
         return 0
     
@@ -177,6 +205,12 @@ class TwoFactorAuthTool:
                 print(f"Backup: {data['backup']}")
             if phrase or all and data.get("phrase"):
                 print(f"Phrase: {data['phrase']}")
+            if all and data.get("algorithm"):
+                print(f"Algorithm: {data['algorithm']}")
+            if all and data.get("digits"):
+                print(f"Digits: {data['digits']}")
+            if all and data.get("period"):
+                print(f"Period: {data['period']}")
             print()
 
         return 0
@@ -219,8 +253,8 @@ class TwoFactorAuthTool:
         for data in data_list:
             name, issuer, secret, backup, phrase = data.get("name"), data.get("issuer"), data.get("secret"), data.get("backup"), data.get("phrase")
 
-            link = f"otpauth://totp/{name}?secret={secret}&issuer={issuer}".replace(" ", "%20")
-            qr = create_qr_code(link)
+            link = build_uri(entry_params(data)) if secret else ""
+            qr = create_qr_code(link) if link else ""
             all_info += f"{f'Name:       {name}{nl}' if name else ''}{f'Secret:     {secret}{nl}' if secret else ''}{f'Link:       {link}{nl}' if link else ''}{f'Backup:     {backup}{nl}' if backup else ''}{f'Phrase:     {phrase}{nl}' if phrase else ''}\n\n\n"
             secrets += f"{name}\n{secret}\n\n\n" if secret else ""
             links += f"{link}\n" if link else ""
@@ -265,13 +299,101 @@ class TwoFactorAuthTool:
             if not data.get("name") or not data.get("issuer") or not data.get("secret"):
                 print("All 2FA information must be in the JSON file.")
                 return 1
-            link = f"otpauth://totp/{data['name']}?secret={data['secret']}&issuer={data['issuer']}".replace(" ", "%20")
+            link = build_uri(entry_params(data))
             qr = create_qr_code(link)
             print(f'{data["name"]}\n\n{qr}\n\n')
 
         return 0
     
-    def code(self, json: str, name: str, secret: str):
+    def export_qr(self, json: str, directory: str, kind: str, scale: int, workers: int) -> int:
+        """
+        Exports one QR image per account into a directory. Filenames are hashed from
+        the image contents, so accounts whose image already exists are skipped. Images
+        are tracked in a manifest in the directory, and only the ones export-qr wrote
+        for accounts that were since removed or changed are deleted.
+
+        Args:
+            json (str): The directory where the JSON file is located.
+            directory (str): The directory to write the images to. Required.
+            kind (str): The image format, either "png" or "svg".
+            scale (int): The size of a single QR module in pixels.
+            workers (int): The number of worker processes used for rendering.
+
+        Returns:
+            int: 0 if the operation is successful, 1 otherwise.
+        """
+        json = test_json(json, config)
+        if not json:
+            print("JSON file does not exist, or is not valid.")
+            return 1
+        if not directory:
+            print("Must specify an output directory.")
+            return 1
+        if kind not in QR_IMAGE_KINDS:
+            print(f"Image format must be one of: {', '.join(QR_IMAGE_KINDS)}.")
+            return 1
+        if scale < 1 or (workers is not None and workers < 1):
+            print("Scale and workers must be positive.")
+            return 1
+        if os.path.exists(directory) and not os.path.isdir(directory):
+            print("Output path exists and is not a directory.")
+            return 1
+        os.makedirs(directory, exist_ok=True)
+
+        data_list = get_data_list(json, config)
+        if data_list == 1:
+            return 1
+
+        expected = {}
+        for data in data_list:
+            if not data.get("name") or not data.get("issuer") or not data.get("secret"):
+                print(f"Skipping {data.get('name')}: name, issuer and secret are required.")
+                continue
+            link = build_uri(entry_params(data))
+            filename = qr_image_filename(data["name"], link, kind, scale)
+            expected[filename] = (data["name"], link)
+
+        manifest = load_qr_manifest(directory)
+        existing = set(os.listdir(directory))
+        pending = {filename: link for filename, (name, link) in expected.items() if filename not in existing}
+
+        try:
+            if pending:
+                with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(pending))) as pool:
+                    futures = [pool.submit(render_qr_image, link, os.path.join(directory, filename), kind, scale) for filename, link in pending.items()]
+                    for future in futures:
+                        future.result()
+        finally:
+            for filename, (name, link) in expected.items():
+                if os.path.isfile(os.path.join(directory, filename)):
+                    manifest[filename] = {"name": name, "kind": kind, "scale": scale}
+            save_qr_manifest(directory, manifest)
+
+        # An image is current only if some account still renders to it at the image's
+        # own format and scale. The filename hashes the link, so a removed account or
+        # a changed secret or parameter makes it stale in every format.
+        current = {
+            qr_image_filename(name, link, entry["kind"], entry["scale"])
+            for entry in manifest.values()
+            for name, link in expected.values()
+        }
+        removed = 0
+        for filename, entry in list(manifest.items()):
+            path = os.path.join(directory, filename)
+            if filename in current:
+                continue
+            if not os.path.isfile(path):
+                del manifest[filename]
+            else:
+                os.remove(path)
+                removed += 1
+                del manifest[filename]
+        save_qr_manifest(directory, manifest)
+
+        print(f"Rendered {len(pending)}, skipped {len(expected) - len(pending)}, removed {removed}.")
+        return 0
+
+    def code(self, json: str, name: str, secret: str, algorithm: str = None, digits: int = None, period: int = None):
         """
         Generates a code for the 2FA.
 
@@ -279,12 +401,20 @@ class TwoFactorAuthTool:
             json (str): The directory where the JSON file is located. Required.
             name (str): The name of the account you want to generate.
             secret (str): The secret key for the 2FA.
+            algorithm (str): The hash algorithm used with --secret. Defaults to SHA1.
+            digits (int): The number of digits used with --secret. Defaults to 6.
+            period (int): The period in seconds used with --secret. Defaults to 30.
 
         Returns:
             str: The code.
         """
         if secret is not None:
-            code = gen_code(secret)
+            try:
+                params = make_params(None, None, secret, algorithm, digits, period)
+            except ValueError as e:
+                print(f"Invalid 2FA parameters: {e}")
+                return 1
+            code = gen_code(params)
             print(f'Code: {code}')
             return 0
 
@@ -303,7 +433,7 @@ class TwoFactorAuthTool:
             return 1
         
         for data in specified:
-            code = gen_code(data["secret"])
+            code = gen_code(entry_params(data))
             print(f'{data["name"]} Code: {code}')
 
         return 0
@@ -333,8 +463,76 @@ class TwoFactorAuthTool:
             if choice.lower()!= "y":
                 print("Operation cancelled.")
                 return 1
+            take_snapshot(json, "nuke", config)
             write_file(json, JSON.dumps([]))
             write_file(text, "")
 
         return 0
-        
\ No newline at end of file
+
+    def history(self, json: str) -> int:
+        """
+        Lists the snapshots recorded for the JSON file, oldest first.
+
+        Args:
+            json (str): The directory where the JSON file is located.
+
+        Returns:
+            int: 0 if the operation is successful, 1 otherwise.
+        """
+        json = test_json(json, config)
+        if not json:
+            print("JSON file does not exist, or is not valid.")
+            return 1
+
+        index = load_index(get_history_directory(json))
+        if len(index) == 0:
+            print("No snapshots recorded.")
+            return 0
+
+        print("Each version holds the JSON file as it was up to the change made at its time.\n")
+        for record in index:
+            print(f"Version {record['version']}:  {record['timestamp']}  before {record['command']}  ({record['count']} objects, {record['kind']})")
+
+        return 0
+
+    def restore(self, json: str, at: str, force: bool) -> int:
+        """
+        Restores the JSON file to a recorded snapshot. The current contents are
+        snapshotted first, so a restore can itself be rolled back.
+
+        Args:
+            json (str): The directory where the JSON file is located.
+            at (str): The version number, or an ISO 8601 timestamp, to restore. Required.
+            force (bool): Flag to skip the confirmation prompt.
+
+        Returns:
+            int: 0 if the operation is successful, 1 otherwise.
+        """
+        json = test_json(json, config)
+        if not json:
+            print("JSON file does not exist, or is not valid.")
+            return 1
+        if not at:
+            print("Must specify a version or timestamp with --at.")
+            return 1
+
+        history = get_history_directory(json)
+        index = load_index(history)
+        position = find_snapshot(index, at)
+        if position == len(index):
+            print("No changes were made after that time. The JSON file already holds that state.")
+            return 0
+        if position is None:
+            print("Could not find a snapshot matching --at. See the history command.")
+            return 1
+
+        if not force:
+            choice = input(f"Are you sure you want to restore the JSON file to version {index[position]['version']}? (y/n)")
+            if choice.lower() != "y":
+                print("Operation cancelled.")
+                return 1
+
+        data_list = rebuild(history, index, position)
+        take_snapshot(json, "restore", config)
+        write_file(json, JSON.dumps(data_list))
+        return 0